@@ -1,169 +1,232 @@
+import os
+import pickle
 import re
-from collections import defaultdict, deque
+from array import array
+from bisect import bisect_left
+from collections import deque
 from typing import Dict, List, Set, Tuple
 
-def normalize_course_code(s: str) -> str:
-    # Strip whitespace and normalize spaces. We keep letters + numbers + optional suffix.
-    return re.sub(r'\s+', ' ', s.strip()).upper()
-
-def split_top_level_and_groups(text: str) -> List[str]:
-    """
-    Heuristic: split top-level by ' and ' (as the main conjunction). 
-    Each piece may contain alternatives separated by ' or ', commas, 'one of', or '/'.
-    """
-    # unify separators
-    t = text.strip()
-    # remove trailing notes like "or consent of instructor." by splitting on 'consent of'
-    t = re.split(r'\bconsent of\b', t, flags=re.I)[0]
-    # Replace common phrases to simplify parsing
-    t = t.replace('one of:', 'one of').replace('one of', 'one of')
-    # Normalize whitespace
-    t = re.sub(r'\s+', ' ', t)
-    # Split by ' and ' as main separator (case-insensitive)
-    parts = re.split(r'\s+\band\b\s+', t, flags=re.I)
-    return [p.strip(' .;') for p in parts if p.strip()]
-
-def extract_alternatives(piece: str) -> List[str]:
-    """
-    Given a piece that may contain alternatives, return list of course codes/names that satisfy this piece.
-    Heuristics handle:
-      - "A or B"
-      - "A, B, or C" or "A, B" (commas)
-      - "one of A, B, C"
-      - slashes "A/B"
-    Returns normalized course codes (strings).
-    """
-    p = piece
-    # If phrase starts with "one of", strip it
-    p = re.sub(r'^\s*one of\s*[:\-]?\s*', '', p, flags=re.I)
-    # split on ' or ' first
-    alt = re.split(r'\s+\bor\b\s+', p, flags=re.I)
-    # if there's still commas in entries, break those up
-    candidates = []
-    for a in alt:
-        # replace '/' with comma to split as alternatives as well
-        a = a.replace('/', ',')
-        # split by commas and semicolons
-        subparts = re.split(r'\s*,\s*|\s*;\s*', a)
-        for s in subparts:
-            s = s.strip()
-            if not s:
-                continue
-            # Try to capture course codes using regex: e.g., "BIOCH 200", "CHEM 102", "3 units in BIOCH" => ignore the '3 units' bits
-            # We'll capture patterns like AAAAA 000 (letters+space+digits+optional suffix)
-            m = re.search(r'([A-Z]{2,5}\s*\d{2,4}[A-Z]?)', s.upper())
-            if m:
-                candidates.append(normalize_course_code(m.group(1)))
-            else:
-                # fallback: if the token looks like "BIOCH" or contains letters+digits glue, take token
-                token = re.sub(r'[^A-Z0-9 ]', '', s.upper())
-                token = token.strip()
-                if re.match(r'^[A-Z]{2,5}\s*\d{2,4}[A-Z]?$', token):
-                    candidates.append(normalize_course_code(token))
-                # else ignore text like "consent of instructor" or "60 units"
-    # Remove duplicates while preserving order
-    seen = set()
-    out = []
-    for c in candidates:
-        if c not in seen:
-            out.append(c)
-            seen.add(c)
-    return out
+# The string-parsing kernel lives in eligibility_parse, a pure, fully
+# annotated module that can optionally be compiled with mypyc (see its
+# docstring). Re-exported here so existing imports keep working.
+from eligibility_parse import (
+    normalize_course_code,
+    split_top_level_and_groups,
+    extract_alternatives,
+    parse_prereq_line,
+    _parse_req_text,
+)
+
+# Optional numba acceleration: when numba (and the numpy it depends on) is
+# installed, the Kahn inner loop runs as native code over the CSR arrays.
+# Neither is required — there is always a pure-Python path.
+try:
+    import numpy as _np
+    from numba import njit as _njit
+except ImportError:
+    _np = None
+    _njit = None
 
-def parse_prereq_line(line: str) -> Tuple[str, List[List[str]]]:
-    """
-    Parse a single line like:
-      'BIOCH 310 : BIOCH 200, CHEM 102 (or SCI 100) and CHEM 263 with a minimum GPA...'
-    Return:
-      course_code, requirements
-      where requirements is a list of requirement-groups (each group is a list of alternatives)
-      e.g. [['BIOCH 200'], ['CHEM 102','SCI 100'], ['CHEM 263']]
-    """
-    if ':' not in line:
-        return None, []
-    left, right = line.split(':', 1)
-    course = normalize_course_code(left)
-    req_text = right.strip()
-    # If right side is like 'consent of instructor' or empty, return empty requirements
-    if re.search(r'\bconsent of\b', req_text, flags=re.I) or req_text.strip()=='':
-        return course, []
-    # heuristics: split by top-level 'and'
-    parts = split_top_level_and_groups(req_text)
-    requirements = []
-    for p in parts:
-        alts = extract_alternatives(p)
-        if alts:
-            requirements.append(alts)
-        # else: could be "60 units" or "90 units" or "third year standing" — ignore for code-based prereq graph
-    return course, requirements
+if _njit is not None:
+    @_njit(cache=True)
+    def _kahn_native(indptr, indices, indeg):
+        n = indeg.shape[0]
+        order = _np.empty(n, _np.int32)
+        q = _np.empty(n, _np.int32)
+        head = 0
+        tail = 0
+        for i in range(n):
+            if indeg[i] == 0:
+                q[tail] = i
+                tail += 1
+        ind = indeg.copy()
+        k = 0
+        while head < tail:
+            u = q[head]
+            head += 1
+            order[k] = u
+            k += 1
+            for j in range(indptr[u], indptr[u + 1]):
+                v = indices[j]
+                ind[v] -= 1
+                if ind[v] == 0:
+                    q[tail] = v
+                    tail += 1
+        return order[:k]
 
 def load_and_parse(file_path: str) -> Dict[str, List[List[str]]]:
     """
     Reads the prereq file, returns dict:
       course_code -> list of requirement groups (each group is list of alternatives)
+    The parsed result is cached in a pickle sidecar (<file>.cache.pkl)
+    keyed on the source file's mtime and size, so later runs skip parsing
+    unless the file changed. The cache is best-effort: any unreadable or
+    stale sidecar just means a fresh parse.
     """
-    parsed = {}
-    with open(file_path, 'r', encoding='utf-8') as f:
+    st = os.stat(file_path)
+    key = (int(st.st_mtime), st.st_size)
+    cache_path = file_path + '.cache.pkl'
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, parsed = pickle.load(f)
+        if cached_key == key:
+            return parsed
+    except (OSError, pickle.PickleError, EOFError, ValueError):
+        pass
+
+    parsed = _parse_file(file_path)
+
+    try:
+        with open(cache_path, 'wb') as f:
+            pickle.dump((key, parsed), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return parsed
+
+def _parse_file(file_path: str) -> Dict[str, List[List[str]]]:
+    parsed: Dict[str, List[List[str]]] = {}
+    with open(file_path, 'r', encoding='utf-8', buffering=1 << 20) as f:
         for raw in f:
-            line = raw.strip()
-            if not line:
+            # partition checks for ':' and splits in one scan; blank or
+            # junk lines without a colon fall through here
+            left, sep, right = raw.partition(':')
+            if not sep:
                 continue
-            # ignore lines that don't look like "CODE : ..." ?
-            if ':' not in line:
-                # try to join with previous? For simplicity, skip
+            course = normalize_course_code(left)
+            if not course:
                 continue
-            course, reqs = parse_prereq_line(line)
-            if course:
-                # if duplicate lines appear, combine requirements (extend)
-                if course in parsed and reqs:
-                    parsed[course].extend(reqs)
-                else:
-                    parsed.setdefault(course, []).extend(reqs)
+            req_text = right.strip()
+            if not req_text:
+                parsed.setdefault(course, [])
+                continue
+            # if duplicate lines appear, combine requirements (extend)
+            reqs = [list(g) for g in _parse_req_text(req_text)]
+            parsed.setdefault(course, []).extend(reqs)
     return parsed
 
 
-def build_graph(parsed_reqs: Dict[str, List[List[str]]]) -> Tuple[Dict[str, Set[str]], Dict[str,int]]:
+def build_graph(parsed_reqs: Dict[str, List[List[str]]]) -> Tuple[List[str], Dict[str, int], array, array, array]:
     """
-    Build directed graph edges: prereq_course -> course
-    Returns adjacency dict and indegree map for all encountered courses.
+    Build the directed graph prereq_course -> course in CSR (compressed
+    sparse row) form over integer node ids, so the sort walks flat int
+    arrays instead of hashing strings per edge.
+    Returns (courses, id_of, indptr, indices, indeg):
+      courses[i] is the code for node i, id_of maps code -> id,
+      the out-edges of node u are indices[indptr[u]:indptr[u+1]],
+      and indeg[v] counts incoming edges.
     """
-    adj = defaultdict(set)
-    indeg = defaultdict(int)
-    all_courses = set(parsed_reqs.keys())
-    # include all prerequisites nodes too
+    id_of: Dict[str, int] = {}
+    courses: List[str] = []
+
+    def node(code):
+        i = id_of.get(code)
+        if i is None:
+            i = id_of[code] = len(courses)
+            courses.append(code)
+        return i
+
+    # collect deduplicated edges (a prereq can appear in several groups)
+    edges = []
+    seen_edges = set()
     for course, req_groups in parsed_reqs.items():
-        all_courses.add(course)
+        cid = node(course)
         for group in req_groups:
             for prereq in group:
-                all_courses.add(prereq)
-                if course not in adj[prereq]:
-                    adj[prereq].add(course)
-    # compute indegrees
-    for node in all_courses:
-        indeg[node] = 0
-    for u, neighbors in adj.items():
-        for v in neighbors:
-            indeg[v] += 1
-    return adj, indeg
-
-def kahn_topological_sort(adj: Dict[str, Set[str]], indeg: Dict[str,int]) -> Tuple[List[str], bool]:
+                e = (node(prereq), cid)
+                if e not in seen_edges:
+                    seen_edges.add(e)
+                    edges.append(e)
+
+    n = len(courses)
+    indeg = array('i', [0]) * n if n else array('i')
+    counts = [0] * (n + 1)
+    for u, v in edges:
+        counts[u + 1] += 1
+        indeg[v] += 1
+    # prefix sums give the row pointers; counting sort fills the columns
+    for i in range(n):
+        counts[i + 1] += counts[i]
+    indptr = array('i', counts)
+    indices = array('i', [0]) * len(edges) if edges else array('i')
+    fill = counts[:-1]
+    for u, v in edges:
+        indices[fill[u]] = v
+        fill[u] += 1
+    return courses, id_of, indptr, indices, indeg
+
+# Scratch indegree buffer reused across kahn_topological_sort calls, so
+# repeated sorts (e.g. one per student) refill one buffer in place instead
+# of allocating a fresh copy every time. The sort runs single-threaded.
+_INDEG_SCRATCH = array('i')
+
+def kahn_topological_sort(courses: List[str], indptr: array, indices: array, indeg: array) -> Tuple[List[str], bool]:
     """
     Returns (ordering, is_cycle)
     ordering is a list of nodes in topological order if no cycle; if cycle present ordering contains processed nodes.
     is_cycle True if cycle detected.
+    The indeg argument is treated as a read-only template and stays intact.
     """
-    q = deque([n for n,d in indeg.items() if d==0])
+    global _INDEG_SCRATCH
+    n = len(courses)
+    if _njit is not None and n:
+        # array('i') exposes the buffer protocol, so the handoff is zero-copy
+        order_ids = _kahn_native(
+            _np.frombuffer(indptr, dtype=_np.int32),
+            _np.frombuffer(indices, dtype=_np.int32),
+            _np.frombuffer(indeg, dtype=_np.int32),
+        )
+        order = [courses[i] for i in order_ids]
+        return order, len(order) != n
+
+    if len(_INDEG_SCRATCH) != n:
+        _INDEG_SCRATCH = array('i', indeg)
+    else:
+        _INDEG_SCRATCH[:] = indeg  # in-place refill, no new allocation
+    ind = _INDEG_SCRATCH
+    q = deque(i for i in range(n) if ind[i] == 0)
     order = []
-    indeg_copy = indeg.copy()
     while q:
         u = q.popleft()
         order.append(u)
-        for v in adj.get(u, []):
-            indeg_copy[v] -= 1
-            if indeg_copy[v]==0:
+        for j in range(indptr[u], indptr[u + 1]):
+            v = indices[j]
+            ind[v] -= 1
+            if ind[v] == 0:
                 q.append(v)
-    is_cycle = len(order) != len(indeg)
-    return order, is_cycle
+    is_cycle = len(order) != n
+    return [courses[i] for i in order], is_cycle
+
+_WHITE, _GRAY, _BLACK = 0, 1, 2
+
+def has_cycle(indptr: array, indices: array) -> bool:
+    """
+    Cycle check only, without the full sort: iterative three-color DFS over
+    the CSR graph that returns True at the first back edge. For cyclic
+    graphs this exits as soon as one is found; for acyclic graphs it is a
+    plain O(V+E) pass with no indegree copy or ordering built.
+    """
+    n = len(indptr) - 1
+    color = bytearray(n)  # all _WHITE
+    for s in range(n):
+        if color[s]:
+            continue
+        color[s] = _GRAY
+        stack = [(s, indptr[s])]
+        while stack:
+            u, j = stack[-1]
+            if j < indptr[u + 1]:
+                stack[-1] = (u, j + 1)
+                v = indices[j]
+                cv = color[v]
+                if cv == _GRAY:
+                    return True
+                if cv == _WHITE:
+                    color[v] = _GRAY
+                    stack.append((v, indptr[v]))
+            else:
+                color[u] = _BLACK
+                stack.pop()
+    return False
 
 def is_requirement_satisfied(group: List[str], completed: Set[str]) -> bool:
     """
@@ -180,19 +243,109 @@ def course_is_eligible(course: str, req_groups: List[List[str]], completed: Set[
         return True
     return all(is_requirement_satisfied(g, completed) for g in req_groups)
 
+def build_requirement_masks(parsed_reqs: Dict[str, List[List[str]]]) -> Tuple[Dict[str, int], Dict[str, List[int]]]:
+    """
+    Precompute the requirements in bitset form for fast repeated queries.
+    Every course code gets a bit position; each requirement group becomes an
+    int mask with the bits of its alternatives set. A group is satisfied iff
+    (group_mask & completed_mask) != 0 — one C-level AND over the whole
+    alternative list instead of per-string set lookups.
+    Returns (bit_of, masks) where masks[course] is one mask per group.
+    """
+    bit_of: Dict[str, int] = {}
+
+    def bit(code):
+        i = bit_of.get(code)
+        if i is None:
+            i = bit_of[code] = len(bit_of)
+        return i
+
+    masks: Dict[str, List[int]] = {}
+    for course, req_groups in parsed_reqs.items():
+        bit(course)
+        group_masks = []
+        for group in req_groups:
+            m = 0
+            for alt in group:
+                m |= 1 << bit(alt)
+            group_masks.append(m)
+        masks[course] = group_masks
+    return bit_of, masks
+
+# Masks are cached per parsed_reqs object (checked by identity, with the
+# dict itself kept in the entry so a recycled id can't alias), letting
+# repeated what-if queries against the same catalogue skip the rebuild.
+_MASK_CACHE: Dict[int, tuple] = {}
+
+def _requirement_masks_for(parsed_reqs):
+    entry = _MASK_CACHE.get(id(parsed_reqs))
+    if entry is None or entry[0] is not parsed_reqs:
+        bit_of, masks = build_requirement_masks(parsed_reqs)
+        entry = (parsed_reqs, bit_of, masks)
+        _MASK_CACHE[id(parsed_reqs)] = entry
+    return entry[1], entry[2]
+
+def _completed_mask(bit_of: Dict[str, int], completed_courses: Set[str]) -> int:
+    mask = 0
+    for c in completed_courses:
+        i = bit_of.get(c)
+        if i is not None:
+            mask |= 1 << i
+    return mask
+
 def eligible_courses(parsed_reqs: Dict[str, List[List[str]]], completed_courses: Set[str]) -> Set[str]:
     """
     Return set of courses from parsed_reqs that student is eligible to take (i.e., prereqs satisfied).
     Excludes courses already completed.
     """
+    bit_of, masks = _requirement_masks_for(parsed_reqs)
+    completed_mask = _completed_mask(bit_of, completed_courses)
     eligible = set()
-    for course, req_groups in parsed_reqs.items():
+    for course, group_masks in masks.items():
         if course in completed_courses:
             continue
-        if course_is_eligible(course, req_groups, completed_courses):
+        for gm in group_masks:
+            if not (gm & completed_mask):
+                break
+        else:
             eligible.add(course)
     return eligible
 
+# Sorted course-code index per catalogue, cached with the same identity
+# scheme as _MASK_CACHE. Codes sort lexicographically, so every code with
+# a given prefix sits in one contiguous range of the sorted list.
+_CODE_INDEX_CACHE: Dict[int, tuple] = {}
+
+def _sorted_codes_for(parsed_reqs):
+    entry = _CODE_INDEX_CACHE.get(id(parsed_reqs))
+    if entry is None or entry[0] is not parsed_reqs:
+        entry = (parsed_reqs, sorted(parsed_reqs))
+        _CODE_INDEX_CACHE[id(parsed_reqs)] = entry
+    return entry[1]
+
+def eligible_by_prefix(parsed_reqs: Dict[str, List[List[str]]], prefix: str, completed_courses: Set[str]) -> List[str]:
+    """
+    Return the courses whose code starts with prefix (e.g. 'BIOCH' or
+    'MATH 1') that the student is eligible to take, sorted, excluding
+    completed courses. A binary search locates the prefix range in the
+    cached sorted index, so only the matching codes are checked instead of
+    scanning the whole catalogue.
+    """
+    prefix = normalize_course_code(prefix)
+    bit_of, masks = _requirement_masks_for(parsed_reqs)
+    completed_mask = _completed_mask(bit_of, completed_courses)
+    codes = _sorted_codes_for(parsed_reqs)
+    out = []
+    i = bisect_left(codes, prefix)
+    while i < len(codes) and codes[i].startswith(prefix):
+        course = codes[i]
+        i += 1
+        if course in completed_courses:
+            continue
+        if all(gm & completed_mask for gm in masks[course]):
+            out.append(course)
+    return out
+
 def scrape_course_prereqs_example(page_html: str) -> List[Tuple[str,str]]:
     """
     Template: given the HTML of a course catalog page or list, use BeautifulSoup to extract (course_code, prereq_text).
@@ -203,9 +356,15 @@ def scrape_course_prereqs_example(page_html: str) -> List[Tuple[str,str]]:
     results = []
     # Example heuristics (customize):
     # - Course entries might be in <div class="course"> <h3>COURSE CODE</h3> <p class="prereq">Prerequisite: ...</p>
-    for block in soup.select('.course, .course-entry'):
-        code_tag = block.select_one('.course-code, h3, .title')
-        prereq_tag = block.select_one('.prereq, .prerequisites, p:contains("Prerequisite")')
+    # find/find_all with class matchers rather than select(): bs4 would
+    # otherwise re-parse the CSS selector string on every call
+    for block in soup.find_all(class_=lambda c: c in ('course', 'course-entry')):
+        code_tag = (block.find(class_='course-code')
+                    or block.find('h3')
+                    or block.find(class_='title'))
+        prereq_tag = (block.find(class_='prereq')
+                      or block.find(class_='prerequisites')
+                      or block.find(lambda tag: tag.name == 'p' and 'Prerequisite' in tag.get_text()))
         if code_tag:
             code = normalize_course_code(code_tag.get_text())
             prereq_text = prereq_tag.get_text() if prereq_tag else ''
@@ -219,13 +378,14 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Course prereq engine demo")
     parser.add_argument('--file', default='prereq.txt', help='path to prereq.txt')
     parser.add_argument('--completed', default='', help='comma-separated completed courses, e.g. "CHEM 102,BIOCH 200"')
+    parser.add_argument('--prefix', default='', help='only report eligible courses whose code starts with this, e.g. "BIOCH"')
     args = parser.parse_args()
 
     parsed = load_and_parse(args.file)
     print(f"Parsed {len(parsed)} courses with explicit prereq patterns (file: {args.file})")
 
-    adj, indeg = build_graph(parsed)
-    order, is_cycle = kahn_topological_sort(adj, indeg)
+    courses, id_of, indptr, indices, indeg = build_graph(parsed)
+    order, is_cycle = kahn_topological_sort(courses, indptr, indices, indeg)
     if is_cycle:
         print("Cycle detected in prereq graph (cannot fully topologically sort). Partial order printed.")
     else:
@@ -236,3 +396,7 @@ if __name__ == "__main__":
     completed = set([normalize_course_code(x) for x in args.completed.split(',') if x.strip()])
     elig = eligible_courses(parsed, completed)
     print(f"Based on completed={completed}, you are eligible for {len(elig)} courses. Sample:", list(sorted(elig))[:20])
+
+    if args.prefix:
+        by_prefix = eligible_by_prefix(parsed, args.prefix, completed)
+        print(f"Eligible courses matching prefix '{normalize_course_code(args.prefix)}': {len(by_prefix)}. Sample:", by_prefix[:20])
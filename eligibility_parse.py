@@ -0,0 +1,150 @@
+"""
+Hot parsing kernel for the prereq engine: course-code normalization and
+prerequisite-text tokenization, split out from eligibility_check so the
+whole module is pure string manipulation with full type annotations.
+
+That makes it compilable as an optional speedup:
+
+    pip install mypy && mypyc eligibility_parse.py
+
+drops a C extension next to this file which Python picks up
+automatically; without it the plain interpreter runs the same code.
+"""
+
+import re
+import sys
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+# Precompiled patterns; parse_prereq_line runs once per course line, so
+# compiling these up front avoids the re-module cache lookup on every call.
+_WS = re.compile(r'\s+')
+_CONSENT = re.compile(r'\bconsent of\b', re.I)
+_AND_SPLIT = re.compile(r'\s+\band\b\s+', re.I)
+
+# Connector/filler words that look like subject codes when a number
+# follows them ("or 303", "one of", "3 units in 2 terms"); a letter run
+# matching one of these is never the subject part of a course code.
+_STOPWORDS = frozenset((
+    'AND', 'ANY', 'AT', 'BOTH', 'EITHER', 'FOR', 'FROM', 'IF', 'IN',
+    'IS', 'OF', 'ON', 'ONE', 'OR', 'PER', 'THE', 'TO', 'WITH',
+))
+
+def normalize_course_code(s: str) -> str:
+    # Strip whitespace and normalize spaces. We keep letters + numbers + optional suffix.
+    # Interning means every copy of a code shares one string object, so the
+    # many set/dict lookups downstream can short-circuit on pointer identity.
+    return sys.intern(_WS.sub(' ', s.strip()).upper())
+
+def split_top_level_and_groups(text: str) -> List[str]:
+    """
+    Heuristic: split top-level by ' and ' (as the main conjunction).
+    Each piece may contain alternatives separated by ' or ', commas, 'one of', or '/'.
+    """
+    # unify separators
+    t = text.strip()
+    # remove trailing notes like "or consent of instructor." by splitting on 'consent of'
+    t = _CONSENT.split(t)[0]
+    # Replace common phrases to simplify parsing
+    t = t.replace('one of:', 'one of').replace('one of', 'one of')
+    # Normalize whitespace
+    t = _WS.sub(' ', t)
+    # Split by ' and ' as main separator (case-insensitive)
+    parts = _AND_SPLIT.split(t)
+    return [p.strip(' .;') for p in parts if p.strip()]
+
+def _scan_codes(s: str) -> List[str]:
+    """
+    Single pass over s emitting every course code it contains, normalized
+    as 'LETTERS DIGITS[SUFFIX]' (e.g. 'BIOCH 200', 'ANAT 600B').
+    A code is a run of 2-5 letters, optional whitespace, 2-4 digits, and an
+    optional trailing letter, where the letter run is not a connector word
+    — otherwise 'MAT E 204 or 301' would emit a phantom 'OR 301'. Commas,
+    slashes and filler like '3 units in BIOCH' fall through without a match,
+    so no pre-splitting of the text is needed.
+    """
+    codes = []
+    u = s.upper()
+    n = len(u)
+    i = 0
+    while i < n:
+        c = u[i]
+        if not ('A' <= c <= 'Z'):
+            i += 1
+            continue
+        # consume the whole run of letters
+        j = i + 1
+        while j < n and 'A' <= u[j] <= 'Z':
+            j += 1
+        if not (2 <= j - i <= 5) or u[i:j] in _STOPWORDS:
+            i = j
+            continue
+        # optional whitespace, then the digit run
+        k = j
+        while k < n and u[k].isspace():
+            k += 1
+        d = k
+        while d < n and '0' <= u[d] <= '9':
+            d += 1
+        if not (2 <= d - k <= 4):
+            i = j
+            continue
+        code = u[i:j] + ' ' + u[k:d]
+        # optional single-letter suffix, e.g. 'MATH 100A'
+        if d < n and 'A' <= u[d] <= 'Z':
+            code += u[d]
+            d += 1
+        codes.append(sys.intern(code))
+        i = d
+    return codes
+
+def extract_alternatives(piece: str) -> List[str]:
+    """
+    Given a piece that may contain alternatives, return list of course codes/names that satisfy this piece.
+    Heuristics handle:
+      - "A or B"
+      - "A, B, or C" or "A, B" (commas)
+      - "one of A, B, C"
+      - slashes "A/B"
+    Returns normalized course codes (strings).
+    """
+    # dict.fromkeys dedupes while preserving first-seen order
+    return list(dict.fromkeys(_scan_codes(piece)))
+
+@lru_cache(maxsize=8192)
+def _parse_req_text(req_text: str) -> Tuple[Tuple[str, ...], ...]:
+    """
+    Parse the right-hand side of a prereq line into requirement groups.
+    Returns a tuple of tuples (hashable, so results can be memoized): the
+    catalogue repeats identical prereq strings across many courses, and the
+    cache lets duplicates skip re-tokenization entirely.
+    """
+    # If right side is like 'consent of instructor', no code-based requirements
+    if _CONSENT.search(req_text):
+        return ()
+    # heuristics: split by top-level 'and'
+    requirements = []
+    for p in split_top_level_and_groups(req_text):
+        alts = extract_alternatives(p)
+        if alts:
+            requirements.append(tuple(alts))
+        # else: could be "60 units" or "90 units" or "third year standing" — ignore for code-based prereq graph
+    return tuple(requirements)
+
+def parse_prereq_line(line: str) -> Tuple[Optional[str], List[List[str]]]:
+    """
+    Parse a single line like:
+      'BIOCH 310 : BIOCH 200, CHEM 102 (or SCI 100) and CHEM 263 with a minimum GPA...'
+    Return:
+      course_code, requirements
+      where requirements is a list of requirement-groups (each group is a list of alternatives)
+      e.g. [['BIOCH 200'], ['CHEM 102','SCI 100'], ['CHEM 263']]
+    """
+    if ':' not in line:
+        return None, []
+    left, right = line.split(':', 1)
+    course = normalize_course_code(left)
+    req_text = right.strip()
+    if req_text == '':
+        return course, []
+    return course, [list(g) for g in _parse_req_text(req_text)]
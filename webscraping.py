@@ -1,10 +1,54 @@
-import requests
-from bs4 import BeautifulSoup
+import re
+
+import requests_cache
+from requests.adapters import HTTPAdapter, Retry
+from bs4 import BeautifulSoup, SoupStrainer
 from urllib.parse import urljoin
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 import json
 
 
+# Number of concurrent fetch workers; the scrape is I/O-bound so wall-clock
+# time scales almost linearly with this up to what the server tolerates.
+MAX_WORKERS = 32
+
+# Shared session with a connection pool so we reuse TCP+TLS connections
+# instead of handshaking once per course page. The on-disk cache means
+# repeat runs serve unchanged pages locally instead of re-downloading the
+# whole catalogue; cache_control=True sends conditional GETs (ETag /
+# Last-Modified) so stale entries revalidate cheaply with a 304.
+session = requests_cache.CachedSession(
+    'ualberta_cache',
+    backend='sqlite',
+    expire_after=timedelta(days=1),
+    allowable_codes=[200],
+    cache_control=True,
+)
+_adapter = HTTPAdapter(
+    pool_connections=MAX_WORKERS,
+    pool_maxsize=MAX_WORKERS,
+    max_retries=Retry(total=3, backoff_factor=0.3),
+)
+session.mount('https://', _adapter)
+session.mount('http://', _adapter)
+
+# Prefer lxml (C parser, several times faster on real-world HTML) and fall
+# back to the stdlib parser if it isn't installed.
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+# Strainers restrict parsing to the tags each page type actually uses,
+# so the rest of the DOM is skipped entirely.
+_LINKS_ONLY = SoupStrainer('a', href=True)
+_FACULTY_PAGE = SoupStrainer(['h1', 'ul'])
+_COURSE_PAGE = SoupStrainer(['div', 'h1'])
+
+
 def get_faculties(base_url):
     """
     Scrape all faculty URLs from the main catalogue page.
@@ -15,8 +59,8 @@ def get_faculties(base_url):
     Returns:
         list: List of faculty URLs
     """
-    r = requests.get(base_url)
-    soup = BeautifulSoup(r.content, 'html.parser')
+    r = session.get(base_url, timeout=10)
+    soup = BeautifulSoup(r.content, PARSER, parse_only=_LINKS_ONLY)
     
     faculties = []
     for link in soup.find_all('a'):
@@ -39,11 +83,26 @@ def get_departments(faculties, base_url):
         dict: Dictionary mapping faculty names to lists of course URLs
     """
     fac_courses = defaultdict(list)
-    
-    for faculty_url in faculties:
-        r = requests.get(faculty_url)
-        soup = BeautifulSoup(r.content, 'html.parser')
-        
+    seen_urls = set()
+
+    def fetch(url):
+        try:
+            r = session.get(url, timeout=10)
+            return r.content
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+            return None
+
+    # Fetch every faculty page concurrently; parse in the main thread,
+    # same split as scrape_all_courses.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        contents = list(executor.map(fetch, faculties))
+
+    for faculty_url, content in zip(faculties, contents):
+        if content is None:
+            continue
+        soup = BeautifulSoup(content, PARSER, parse_only=_FACULTY_PAGE)
+
         # Extract faculty name from heading
         heading = soup.find('h1')
         if heading:
@@ -58,75 +117,157 @@ def get_departments(faculties, base_url):
                 if anch:
                     href = anch.get('href')
                     if href and 'catalogue/course/' in href:
-                        fac_courses[faculty_name].append(urljoin(base_url, href))
+                        course_url = urljoin(base_url, href)
+                        # the same course page is often linked from several
+                        # menus and cross-listed across faculties; keep the
+                        # first occurrence so it is only fetched once
+                        if course_url not in seen_urls:
+                            seen_urls.add(course_url)
+                            fac_courses[faculty_name].append(course_url)
     
     return fac_courses
 
 
-def prereq_finder(paragraph_tag):
+# Markers checked in order (plural first) with the offset past the label
+_PREREQ_MARKERS = [("prerequisites:", 15), ("prerequisite:", 14)]
+_COREQ_MARKERS = [("corequisites:", 13), ("corequisite:", 12)]
+
+
+def requisite_finder(txt):
     """
-    Extract prerequisite information from a paragraph tag.
-    
+    Extract prerequisite and corequisite information from a course
+    description. The text is lowercased once, then all four labels are
+    probed on that single copy.
+
     Args:
-        paragraph_tag: BeautifulSoup tag object containing course description
-        
+        txt (str): Course description text
+
     Returns:
-        str or int: Prerequisite text, or -1 if not found
+        tuple: (prereq, coreq) where each is the requisite text, or -1 if not found
     """
-    txt = paragraph_tag.text
     lower_txt = txt.lower()
-    
-    # Check for plural form first
-    index = lower_txt.find("prerequisites:")
-    plural = True
-    
-    if index == -1:
-        index = lower_txt.find("prerequisite:")
-        plural = False
-    
-    if index == -1:
-        return -1
-    
-    # Find the end of prerequisite section (period)
-    start_offset = 15 if plural else 14
-    start_pos = index + start_offset
-    
-    end = 0
-    for char in txt[start_pos:]:
-        if char != '.':
-            end += 1
-        else:
+
+    prereq = -1
+    for marker, offset in _PREREQ_MARKERS:
+        index = lower_txt.find(marker)
+        if index != -1:
+            # Prerequisite section runs up to the next period
+            start_pos = index + offset
+            end = txt.find('.', start_pos)
+            prereq = txt[start_pos:end] if end != -1 else txt[start_pos:]
             break
-    
-    return txt[start_pos:start_pos + end]
+
+    coreq = -1
+    for marker, offset in _COREQ_MARKERS:
+        index = lower_txt.find(marker)
+        if index != -1:
+            coreq = txt[index + offset:]
+            break
+
+    return prereq, coreq
+
+
+# Requisite labels located directly in raw HTML — no DOM needed when the
+# label and its text sit inside one tag, which holds for catalogue pages
+_PRE_RX = re.compile(r'(?is)Prerequisites?:\s*(.+?)\.')
+_CO_RX = re.compile(r'(?is)Corequisites?:\s*(.+?)\.')
 
 
-def coreq_finder(paragraph_tag):
+def scrape_course_info(url):
     """
-    Extract corequisite information from a paragraph tag.
-    
+    Fetch a single course page and pull out its requisites without
+    building a parse tree: the compiled regexes run straight over the raw
+    HTML. Use this when only the prereq/coreq strings are needed;
+    scrape_all_courses still builds a soup because it also extracts the
+    department and course structure.
+
     Args:
-        paragraph_tag: BeautifulSoup tag object containing course description
-        
+        url (str): Course page URL
+
     Returns:
-        str or int: Corequisite text, or -1 if not found
+        dict: {'url': ..., 'prerequisites': ..., 'corequisites': ...}
+              with None for any section that was not found
     """
-    txt = paragraph_tag.text
-    lower_txt = txt.lower()
-    
-    # Check for plural form first
-    index = lower_txt.find("corequisites:")
-    plural = True
-    
-    if index == -1:
-        index = lower_txt.find("corequisite:")
-        plural = False
-    
-    if index == -1:
-        return -1
-    
-    start_offset = 13 if plural else 12
-    return txt[index + start_offset:]
+    text = session.get(url, timeout=10).text
+    pre = _PRE_RX.search(text)
+    co = _CO_RX.search(text)
+    return {
+        'url': url,
+        'prerequisites': pre.group(1).strip() if pre else None,
+        'corequisites': co.group(1).strip() if co else None,
+    }
+
+
+# Optional selectolax (Modest engine) parsing for course pages — an order
+# of magnitude faster than bs4 on this workload. Like lxml above, it is
+# used when installed and bs4 remains the fallback.
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxParser
+except ImportError:
+    _SelectolaxParser = None
+
+
+def _course_code_from_link(course_text):
+    """Course links read 'CMPUT 174 - Intro...'; keep the code before the dash."""
+    ind = course_text.find('-')
+    if ind != -1:
+        return course_text[:ind-1].strip()
+    return course_text.strip()
+
+
+def _parse_course_page_selectolax(content):
+    tree = _SelectolaxParser(content)
+    h1 = tree.css_first('div.content div.container h1')
+    dept_name = h1.text() if h1 else "Unknown Department"
+
+    courses = []
+    for elem in tree.css('div.course'):
+        link = elem.css_first('a')
+        if link:
+            course_code = _course_code_from_link(link.text())
+            para = elem.css_first('p')
+            prereq, coreq = requisite_finder(para.text()) if para else (-1, -1)
+            courses.append((course_code, prereq, coreq))
+    return dept_name, courses
+
+
+def _parse_course_page_bs4(content):
+    soup = BeautifulSoup(content, PARSER, parse_only=_COURSE_PAGE)
+
+    dept_name = "Unknown Department"
+    content_div = soup.find('div', class_='content')
+    if content_div:
+        container_div = content_div.find('div', class_='container')
+        if container_div:
+            dept_heading = container_div.find('h1')
+            if dept_heading:
+                dept_name = dept_heading.text
+
+    courses = []
+    for elem in soup.find_all('div', class_=lambda c: c in ("course", "course ms-3")):
+        link = elem.find('a')
+        if link:
+            course_code = _course_code_from_link(link.text)
+            para = elem.find('p')
+            prereq, coreq = requisite_finder(para.text) if para else (-1, -1)
+            courses.append((course_code, prereq, coreq))
+    return dept_name, courses
+
+
+def _parse_course_page(content):
+    """
+    Parse one course-listing page.
+
+    Args:
+        content (bytes): Raw page HTML
+
+    Returns:
+        tuple: (dept_name, [(course_code, prereq, coreq), ...])
+               with -1 for missing requisites
+    """
+    if _SelectolaxParser is not None:
+        return _parse_course_page_selectolax(content)
+    return _parse_course_page_bs4(content)
 
 
 def scrape_all_courses(fac_courses):
@@ -141,72 +282,63 @@ def scrape_all_courses(fac_courses):
               Format: {'Faculty': {'Department': {'COURSE 123': {'prereq': '...', 'coreq': '...'}}}}
     """
     cors = {}  # Structure: {'Faculty': {'Department': {'COURSE 123': {'prereq': '...', 'coreq': '...'}}}}
-    
+
     # Initialize faculty structure
     for faculty in fac_courses:
         cors[faculty] = {}
-    
-    # Process each faculty's courses
-    for faculty_name, course_urls in fac_courses.items():
-        print(f"\nProcessing {faculty_name}...")
-        
-        for url in course_urls:
+
+    # Flatten to (faculty, url) pairs so one pool covers every course page
+    tasks = [
+        (faculty_name, url)
+        for faculty_name, course_urls in fac_courses.items()
+        for url in course_urls
+    ]
+
+    def fetch(task):
+        faculty_name, url = task
+        try:
+            r = session.get(url, timeout=10)
+            return faculty_name, url, r.content
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+            return faculty_name, url, None
+
+    # Fetch concurrently (I/O-bound), but parse and fill the dicts in the
+    # main thread so BeautifulSoup objects and cors are never shared
+    # across threads. executor.map preserves submission order, so courses
+    # still come back grouped by faculty.
+    current_faculty = None
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for faculty_name, url, content in executor.map(fetch, tasks):
+            if content is None:
+                continue
+
+            if faculty_name != current_faculty:
+                print(f"\nProcessing {faculty_name}...")
+                current_faculty = faculty_name
+
             try:
-                r = requests.get(url)
-                soup = BeautifulSoup(r.content, 'html.parser')
-                
-                # Get department name
-                content_div = soup.find('div', class_='content')
-                if content_div:
-                    container_div = content_div.find('div', class_='container')
-                    if container_div:
-                        dept_heading = container_div.find('h1')
-                        if dept_heading:
-                            dept_name = dept_heading.text
-                        else:
-                            dept_name = "Unknown Department"
-                    else:
-                        dept_name = "Unknown Department"
-                else:
-                    dept_name = "Unknown Department"
-                
+                dept_name, page_courses = _parse_course_page(content)
+
                 # Initialize department if not exists
-                if dept_name not in cors[faculty_name]:
-                    cors[faculty_name][dept_name] = {}
-                
-                # Find all course elements
-                course_elements = soup.find_all('div', class_=["course", "course ms-3"])
-                
-                for course_elem in course_elements:
-                    # Extract course code
-                    course_link = course_elem.find('a')
-                    if course_link:
-                        course_text = course_link.text
-                        ind = course_text.find('-')
-                        if ind != -1:
-                            course_code = course_text[:ind-1].strip()
-                        else:
-                            course_code = course_text.strip()
-                        
-                        # Extract prerequisites and corequisites
-                        course_para = course_elem.find('p')
-                        prereq = -1
-                        coreq = -1
-                        
-                        if course_para:
-                            prereq = prereq_finder(course_para)
-                            coreq = coreq_finder(course_para)
-                        
-                        # Store course information
-                        cors[faculty_name][dept_name][course_code] = {
-                            'prereq': prereq if prereq != -1 else None,
-                            'coreq': coreq if coreq != -1 else None
-                        }
-                        
-                        # Print courses with prerequisites
-                        if prereq != -1:
-                            print(f"{course_code}: {prereq}")
-                
+                dept_courses = cors[faculty_name].setdefault(dept_name, {})
+
+                for course_code, prereq, coreq in page_courses:
+                    # Skip courses already recorded for this department
+                    # (cross-listings repeated within a page set)
+                    if course_code in dept_courses:
+                        continue
+
+                    # Store course information
+                    dept_courses[course_code] = {
+                        'prereq': prereq if prereq != -1 else None,
+                        'coreq': coreq if coreq != -1 else None
+                    }
+
+                    # Print courses with prerequisites
+                    if prereq != -1:
+                        print(f"{course_code}: {prereq}")
+
             except Exception as e:
                 print(f"Error processing {url}: {e}")
                 continue
@@ -244,10 +376,19 @@ def save_prereqs_to_txt(cors, filename='prereq.txt'):
     print(f"Prerequisites saved to {filename}")
 
 
-def main():
-    """Main function to orchestrate the scraping process."""
+def main(refresh=False):
+    """
+    Main function to orchestrate the scraping process.
+
+    Args:
+        refresh (bool): If True, clear the HTTP cache and re-download everything
+    """
     base_url = "https://apps.ualberta.ca/catalogue"
-    
+
+    if refresh:
+        print("Clearing HTTP cache...")
+        session.cache.clear()
+
     print("=" * 60)
     print("UAlberta Course Catalogue Scraper")
     print("=" * 60)
@@ -293,4 +434,9 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="UAlberta course catalogue scraper")
+    parser.add_argument('--refresh', action='store_true',
+                        help='clear the HTTP cache and re-download all pages')
+    args = parser.parse_args()
+    main(refresh=args.refresh)